@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+from functools import partial
 from textwrap import indent, dedent
 from typing import Any
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Tuple, Set, Iterator
 
 import math
 
@@ -29,34 +30,79 @@ class Generator:
         random_seed = None  # non-random seed doesn't play nicely with processes
         self.randomiser = Randomiser(seed=random_seed)
 
+        randomiser = self.randomiser
+        self.scalar_generators = {"int": randomiser.random_int,
+                                  "float": randomiser.random_float,
+                                  "double": randomiser.random_double,
+                                  "char": randomiser.random_char,
+                                  "bool": randomiser.random_bool,
+                                  }
+        self.array_generators = {"int": randomiser.random_int_array,
+                                 "float": randomiser.random_float_array,
+                                 "double": randomiser.random_double_array,
+                                 "char": randomiser.random_string,
+                                 "bool": randomiser.random_bool_array,
+                                 }
+
+        # the ordering and generators only depend on the function, so are found once rather than for every example
+        self.safe_parameters = self.runner.safe_parameters()
+        self.generators = [(param, self.generator_for(param)) for param in self.safe_parameters]
+
     def generate(self, n: int) -> List[ExampleInstance]:
         """
         Used to generate multiple examples
 
         :param n: the number of examples to make
-        :return: the examples generated
+        :return: the examples generated, or none if the function could not be run on any of them
         """
-        assert n > 0
-
         try:
-            examples = []
-            fails = 0
-            max_fails = n
-
-            while fails < max_fails and len(examples) < n:
-                example = self.generate_single()
-
-                if example is not None:
-                    examples.append(example)
-                    fails -= 1
-                else:
-                    fails += 1
-
-            return examples
+            return list(self.iter_generate(n))
         except FunctionRunError:
             lumberjack.getLogger("error").error(f"issue calling function {self.runner.name}")
             return []
 
+    def iter_generate(self, n: int) -> Iterator[ExampleInstance]:
+        """
+        Used to generate multiple examples, producing each one as soon as the function has been run on it
+
+        Each input is generated and then run in a new process before the next is made,
+        so only one example's inputs are held at a time.
+        Throws a FunctionRunError if the function could not be run on an input, and stops running the rest.
+
+        :param n: the number of examples to make
+        :return: a generator over the examples
+        """
+        for example_inputs in self.generate_inputs(n):
+            result = run_safe(self.reference, self.runner.lib_path, example_inputs)
+            if result is None:
+                raise FunctionRunError(f"could not produce value from {self.reference.name}")
+
+            value, outputs = result
+            yield ExampleInstance(example_inputs, value, outputs)
+
+    def generate_inputs(self, n: int) -> Iterator[ParameterMapping]:
+        """
+        Used to generate the inputs for multiple examples, only keeping those satisfying the function's constraints
+
+        :param n: the number of inputs to make
+        :return: a generator over the values for input parameters of each example
+        """
+        assert n > 0
+
+        made = 0
+        fails = 0
+        max_fails = n
+
+        while fails < max_fails and made < n:
+            example_inputs = self.generate_input()
+
+            if self.runner.satisfied(example_inputs):
+                yield example_inputs
+                made += 1
+                fails -= 1
+            else:
+                fails += 1
+
     def generate_input(self) -> ParameterMapping:
         """
         Used to generate the input for one example
@@ -65,8 +111,8 @@ class Generator:
         """
         inputs = {}
 
-        for param in self.runner.safe_parameters():
-            inputs[param.name] = self.random(param, inputs)
+        for param, gen in self.generators:
+            inputs[param.name] = gen(inputs)
 
         return inputs
 
@@ -76,19 +122,9 @@ class Generator:
 
         NOTE: this spawns a new process so that if the function crashes on these inputs the rest of the program is safe
 
-        :return: the example generated
+        :return: the example generated, or :code:`None` if no inputs satisfying the constraints were found
         """
-        inputs = self.generate_input()
-
-        if not self.runner.satisfied(inputs):
-            return None
-
-        results = run_safe(self.reference, self.runner.lib_path, inputs)
-        if results is None:
-            raise FunctionRunError(f"could not produce value from {self.reference.name}")
-
-        value, outputs = results
-        return ExampleInstance(inputs, value, outputs)
+        return next(self.iter_generate(1), None)
 
     def random(self, parameter: Parameter, current: ParameterMapping) -> SomeValue:
         """
@@ -97,12 +133,22 @@ class Generator:
         As some parameters depend on others, this function needs to know the values of parameters already generated.
         Hopefully this will be called in an order where dependencies are generated before their dependents.
 
-        This checks the constraints on a parameter too to limit the random sample space to valid values.
-
         :param parameter: the parameter to generate a value for
         :param current: the values already generated
         :return: the new parameter value
         """
+        return self.generator_for(parameter)(current)
+
+    def generator_for(self, parameter: Parameter) -> Callable[[ParameterMapping], SomeValue]:
+        """
+        Builds a function generating random values for an input parameter
+
+        This checks the constraints on a parameter too to limit the random sample space to valid values.
+        The bounds and the generator to use only depend on the parameter, so are chosen once here.
+
+        :param parameter: the parameter to generate values for
+        :return: a function taking the values already generated and returning a new parameter value
+        """
 
         max_val: Optional[SomeValue] = None
         min_val: Optional[SomeValue] = None
@@ -116,37 +162,25 @@ class Generator:
                     min_val = constraint.value
 
         primitive = parameter.type.contents
-        if primitive == "int":
-            def gen():
-                return self.randomiser.random_int(min_val=min_val, max_val=max_val)
-        elif primitive == "float":
-            def gen():
-                return self.randomiser.random_float(min_val=min_val, max_val=max_val)
-        elif primitive == "double":
-            def gen():
-                return self.randomiser.random_double(min_val=min_val, max_val=max_val)
-        elif primitive == "char":
-            def gen():
-                return self.randomiser.random_char()
-        elif primitive == "bool":
-            def gen():
-                return self.randomiser.random_bool()
-        else:
+        if primitive not in self.scalar_generators:
             raise UnsupportedTypeError(primitive)
 
-        if not parameter.is_array():
-            val = gen()
-        else:
-            size = parameter.get_size(None, current)
+        # only numbers can be bounded
+        bounds = {"min_val": min_val, "max_val": max_val} if primitive in {"int", "float", "double"} else {}
 
-            val = self.randomiser.random_array(size, gen)
-            val = val if primitive != "char" else ''.join(val)
+        if not parameter.is_array():
+            gen = partial(self.scalar_generators[primitive], **bounds)
+            return lambda current: gen()
 
-        return val
+        gen_array = partial(self.array_generators[primitive], **bounds)
+        get_size = parameter.size_generator(self.randomiser)
+        return lambda current: gen_array(get_size(current))
 
 
 @dataclass
 class Failure:
+    __slots__ = ("expected", "value", "outputs")
+
     expected: ExampleInstance
     value: Any
     outputs: Dict[str, Any]
@@ -228,8 +262,11 @@ class Evaluator:
         :return: the examples in the file
         """
         with open(example_file, "r") as f:
-            sig = f.readline()
-            examples = f.readlines()
+            # only split on newlines, str.splitlines would also split on characters allowed inside string values
+            sig, *examples = f.read().split("\n")
+
+        if examples and not examples[-1]:
+            examples.pop()  # the file ended with a newline
 
         return parse(sig, examples)
 
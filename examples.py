@@ -1,8 +1,10 @@
+import re
 from dataclasses import dataclass
-from re import match
+from functools import lru_cache
 from typing import *
 
-from reference_parser import CType, CParameter, UnsupportedTypeError, FunctionReference
+from reference_parser import CType, CParameter, UnsupportedTypeError, FunctionReference, string_type, \
+    void_type
 from helper_types import *
 from typing import Dict, List, Tuple, Set
 
@@ -11,11 +13,192 @@ base_str = "({inputs}) {value} ({outputs})"
 TypeMapping = List[Tuple[Name, CType]]
 ParserMapping = List[Tuple[Name, Parser]]
 
+# the characters which can follow a value
+delimiters = frozenset(",)]")
+
+# returned by a parser that could not parse a value, as None is itself a valid value (for void)
+_FAIL = object()
+
+
+class Lexer:
+    """
+    A cursor over an example string
+
+    Lexemes are read by inspecting characters directly, which is much cheaper than a regex for these simple tokens.
+    Every read skips any leading whitespace, and only consumes the lexeme itself if the read succeeds,
+    otherwise :code:`_FAIL` is returned.
+    """
+    __slots__ = ("s", "i")
+
+    def __init__(self, s: str, i: int = 0):
+        self.s = s
+        self.i = i
+
+    def skip_ws(self) -> int:
+        """
+        :return: the new position of the cursor
+        """
+        s, i = self.s, self.i
+        n = len(s)
+        while i < n and s[i].isspace():
+            i += 1
+        self.i = i
+        return i
+
+    def peek(self) -> str:
+        """
+        :return: the character under the cursor, or an empty string at the end of the input
+        """
+        return self.s[self.i:self.i + 1]
+
+    def expect(self, ch: str) -> bool:
+        """
+        Consumes a single (optionally whitespace-prefixed) character
+
+        :param ch: the character to consume
+        :return: :code:`True` if the character was found
+        """
+        s, i = self.s, self.i
+        if not s.startswith(ch, i):
+            # usually the character directly follows the previous lexeme, so only skip whitespace if it does not
+            i = self.skip_ws()
+            if not s.startswith(ch, i):
+                return False
+
+        self.i = i + 1
+        return True
+
+    def delimiter(self) -> str:
+        """
+        Consumes the (optionally whitespace-prefixed) separator or closing bracket following a value
+
+        A single read covers all of the characters which could follow a value, rather than trying each in turn.
+
+        :return: the delimiter that was consumed, or an empty string if there was not one
+        """
+        s, i = self.s, self.i
+        if i < len(s) and s[i].isspace():
+            i = self.skip_ws()
+
+        c = s[i:i + 1]
+        if c not in delimiters:
+            return ""
+
+        self.i = i + 1
+        return c
+
+    def _digits(self, i: int) -> int:
+        s = self.s
+        n = len(s)
+        while i < n and s[i].isdecimal():
+            i += 1
+        return i
+
+    def _int_end(self, i: int) -> int:
+        j = i + 1 if self.s.startswith("-", i) else i
+        k = self._digits(j)
+
+        return k if k > j else -1
+
+    def read_int(self) -> Union[int, object]:
+        i = self.skip_ws()
+        end = self._int_end(i)
+        if end < 0:
+            return _FAIL
+
+        self.i = end
+        return int(self.s[i:end])
+
+    def read_real(self) -> Union[float, object]:
+        i = self.skip_ws()
+        end = self._int_end(i)
+        if end < 0:
+            return _FAIL
+
+        s = self.s
+        if s.startswith(".", end):
+            frac_end = self._digits(end + 1)
+            if frac_end > end + 1:
+                end = frac_end
+
+        self.i = end
+        return float(s[i:end])
+
+    def read_char(self) -> Union[str, object]:
+        """
+        Reads a quoted character, escaped characters are kept in their escaped form (e.g. :code:`\\n`)
+
+        :return: the character if one was found, otherwise :code:`_FAIL`
+        """
+        i = self.skip_ws()
+        s = self.s
+        if not s.startswith("'", i) or i + 2 >= len(s):
+            return _FAIL
+
+        c = s[i + 1]
+        if c == "'":
+            return _FAIL
+
+        end = i + 2
+        if c == "\\":
+            if s[end] == "\n":
+                return _FAIL
+            end += 1
+
+        if not s.startswith("'", end):
+            return _FAIL
+
+        self.i = end + 1
+        return s[i + 1:end]
+
+    def read_string(self) -> Union[str, object]:
+        """
+        Reads a double-quoted string, escaped characters are kept in their escaped form
+
+        :return: the contents of the string if one was found, otherwise :code:`_FAIL`
+        """
+        i = self.skip_ws()
+        s = self.s
+        if not s.startswith('"', i):
+            return _FAIL
+
+        # jump between quotes and backslashes, skipping over any escaped characters
+        k = i + 1
+        end = s.find('"', k)
+        while end != -1:
+            if (esc := s.find("\\", k, end)) == -1:
+                self.i = end + 1
+                return s[i + 1:end]
+
+            if s[esc + 1] == "\n":
+                return _FAIL
+
+            k = esc + 2
+            if k > end:
+                end = s.find('"', k)
+
+        return _FAIL
+
+    def read_bool(self) -> Union[bool, object]:
+        i = self.skip_ws()
+        s = self.s
+        if s.startswith("True", i):
+            self.i = i + 4
+            return True
+        elif s.startswith("False", i):
+            self.i = i + 5
+            return False
+        else:
+            return _FAIL
+
+
 @dataclass
 class ExampleInstance:
     """
     Contains the values for one example
     """
+    __slots__ = ("inputs", "value", "outputs")
+
     inputs: ParameterMapping
     value: AnyValue
     outputs: ParameterMapping
@@ -29,14 +212,7 @@ class ExampleInstance:
         :param outputs: the types of the output values
         :return: the formatted string
         """
-        inp_vals = [form_value(self.inputs[name], c_type)
-                    for name, c_type in inputs]
-        outp_vals = [form_value(self.outputs[name], c_type)
-                     for name, c_type in outputs]
-
-        return base_str.format(inputs=", ".join(inp_vals),
-                               value=form_value(self.value, value),
-                               outputs=", ".join(outp_vals))
+        return example_former(inputs, value, outputs)(self)
 
     @staticmethod
     def parse(inputs: ParserMapping, value: Parser, outputs: ParserMapping, s: str):
@@ -52,7 +228,7 @@ class ExampleInstance:
             :return: the example that has been parsed. Returns :code:`None` if this example could not be parsed
             """
 
-        def parse_group(s: str, grp: ParserMapping) -> Optional[Tuple[ParameterMapping, str]]:
+        def parse_group(lx: Lexer, grp: ParserMapping) -> Optional[ParameterMapping]:
             """
             Helper function to parse something of the form:
 
@@ -60,42 +236,36 @@ class ExampleInstance:
 
             where <values> is a comma-separated list of values that can be parsed by the parsers in :code:`grp`.
 
-            :param s: the string to parse
+            :param lx: the lexer to parse from
             :param grp: the parsers to use to parse this group
-            :return: a standard parse result; the values and the new string position if successful
-            or :code:`None` if not
+            :return: the values if successful or :code:`None` if not
             """
-            s = s[s.index("(") + 1:]
+            if not lx.expect("("):
+                return None
 
             grp_vals = {}
             for name, parser in grp:
-                if (parsed := parser(s)) is None:
+                if (val := parser(lx)) is _FAIL:
                     return None
 
-                val, s = parsed
                 grp_vals[name] = val
 
-                if (m := match(r"\s*,", s)) is not None:
-                    s = s[m.end():]
+                lx.expect(",")
 
-            if (m := match(r"\s*\)", s)) is not None:
-                s = s[m.end():]
-            else:
+            if not lx.expect(")"):
                 return None
 
-            return grp_vals, s
+            return grp_vals
 
-        if (parsed := parse_group(s, inputs)) is None:
+        lx = Lexer(s)
+        if (input_vals := parse_group(lx, inputs)) is None:
             return None
-        input_vals, s = parsed
 
-        if (parsed := value(s)) is None:
+        if (ret_val := value(lx)) is _FAIL:
             return None
-        ret_val, s = parsed
 
-        if (parsed := parse_group(s, outputs)) is None:
+        if (output_vals := parse_group(lx, outputs)) is None:
             return None
-        output_vals, s = parsed
 
         return ExampleInstance(input_vals, ret_val, output_vals)
 
@@ -123,10 +293,49 @@ def form(reference: FunctionReference, examples: List[ExampleInstance]) -> List[
 
 def form_examples(inputs: TypeMapping, value: CType, outputs: TypeMapping,
                   examples: List[ExampleInstance]) -> List[str]:
-    sig_str = [form_ref(inputs, value, outputs)]
-    example_strs = [ex.form(inputs, value, outputs) for ex in examples]
+    form_example = example_former(inputs, value, outputs)
+
+    # built as a single list, rather than joining a list of the signature to a list of the examples
+    return [form_ref(inputs, value, outputs), *map(form_example, examples)]
+
+
+def example_former(inputs: TypeMapping, value: CType, outputs: TypeMapping) -> Callable[[ExampleInstance], str]:
+    """
+    Builds a function to format examples of a single signature
 
-    return sig_str + example_strs
+    The formatting of each value is chosen once here and written into a single template for the whole example,
+    so formatting an example is one :code:`str.format` call rather than a formatter call for every value.
+
+    :param inputs: the types of all of the input values
+    :param value: the return type
+    :param outputs: the types of the output values
+    :return: a function creating the formatted string representation of an example
+    """
+    template = base_str.format(inputs=", ".join([field_for(f"0[{name}]", c_type) for name, c_type in inputs]),
+                               value=field_for("1", value),
+                               outputs=", ".join([field_for(f"2[{name}]", c_type) for name, c_type in outputs]))
+    fill = template.format
+
+    def form_example(example: ExampleInstance) -> str:
+        return fill(example.inputs, example.value, example.outputs)
+
+    return form_example
+
+
+def field_for(field: str, c_type: CType) -> str:
+    """
+    Builds the replacement field formatting a value of a given type, giving the same result as :code:`formatter_for`
+
+    :param field: the name of the field to format
+    :param c_type: the type of the value
+    :return: the replacement field, including any surrounding quotes
+    """
+    if c_type == string_type:
+        return f'"{{{field}}}"'
+    elif c_type == void_type:
+        return "_"
+
+    return f"{{{field}}}"
 
 
 def form_ref(inputs: TypeMapping, value: CType, outputs: TypeMapping) -> str:
@@ -139,12 +348,30 @@ def form_ref(inputs: TypeMapping, value: CType, outputs: TypeMapping) -> str:
 
 
 def form_value(val: AnyValue, c_type: CType) -> str:
-    if c_type == CType("char", 1):
-        return f'"{val}"'
-    elif c_type == CType("void", 0):
-        return "_"
+    return formatter_for(c_type)(val)
 
-    return str(val)
+
+def formatter_for(c_type: CType) -> Callable[[AnyValue], str]:
+    """
+    Fetch the correct formatter for a given type
+
+    :param c_type: the type to format
+    :return: a function converting a value of that type to its string form in an example
+    """
+    if c_type == string_type:
+        return form_string
+    elif c_type == void_type:
+        return form_missing
+
+    return str
+
+
+def form_string(val: str) -> str:
+    return f'"{val}"'
+
+
+def form_missing(val: None) -> str:
+    return "_"
 
 
 def parse(sig: str, examples: List[str]) -> List[ExampleInstance]:
@@ -226,111 +453,237 @@ def parse_examples(inputs: ParserMapping, value: Parser, outputs: ParserMapping,
     :return: the ExampleInstance built from this selection
     """
 
+    parse_example = compile_parser(inputs, value, outputs)
+
     vals = []
     for example in examples:
-        val = ExampleInstance.parse(inputs, value, outputs, example)
+        val = parse_example(example)
         if val is not None:
             vals.append(val)
 
     return vals
 
 
+def compile_parser(inputs: ParserMapping, value: Parser, outputs: ParserMapping) -> Callable[
+    [str], Optional[ExampleInstance]]:
+    """
+    Builds a parser for examples of a single signature
+
+    This behaves exactly like :code:`ExampleInstance.parse`,
+    but as the parsers are known in advance the source for a specialised parser is generated and compiled.
+    This unrolls the loops over each group, and stores the values of each group as a :code:`ParameterValues`.
+
+    :param inputs: parsers for the input values
+    :param value: a parser for the return value
+    :param outputs: parsers for the output values
+    :return: a function parsing a single example, returning :code:`None` if it could not be parsed
+    """
+    namespace = {"Lexer": Lexer, "ExampleInstance": ExampleInstance, "ParameterValues": ParameterValues, "FAIL": _FAIL,
+                 "value_parser": value, "empty_values": ParameterValues({}, ())}
+    # the lexer's methods are bound once per example, keeping the generated body to plain local calls
+    lines = ["def parse_example(s):",
+             "    lx = Lexer(s)",
+             "    expect, delimiter = lx.expect, lx.delimiter"]
+
+    def group(grp: ParserMapping, prefix: str) -> str:
+        lines.extend(["    if not expect('('):",
+                      "        return None"])
+
+        positions_name = f"{prefix}_positions"
+        namespace[positions_name] = {name: idx for idx, (name, _) in enumerate(grp)}
+
+        if not grp:
+            lines.extend(["    if not expect(')'):",
+                          "        return None"])
+
+            # very common for outputs, as the values are read-only all examples can share the same empty group
+            return "empty_values"
+
+        fields = []
+        for idx, (name, parser) in enumerate(grp):
+            parser_name = f"{prefix}_parser_{idx}"
+            namespace[parser_name] = parser
+
+            lines.extend([f"    if ({prefix}_{idx} := {parser_name}(lx)) is FAIL:",
+                          f"        return None"])
+            if idx < len(grp) - 1:
+                lines.append(f"    expect(',')")
+            fields.append(f"{prefix}_{idx},")
+
+        # the last value is followed by the closing bracket, possibly after a trailing comma
+        lines.extend(["    if (delim := delimiter()) == ',':",
+                      "        delim = delimiter()",
+                      "    if delim != ')':",
+                      "        return None"])
+
+        return f"ParameterValues({positions_name}, ({' '.join(fields)}))"
+
+    input_vals = group(inputs, "input")
+    lines.extend(["    if (ret_val := value_parser(lx)) is FAIL:",
+                  "        return None"])
+    output_vals = group(outputs, "output")
+    lines.append(f"    return ExampleInstance({input_vals}, ret_val, {output_vals})")
+
+    exec("\n".join(lines), namespace)
+    return namespace["parse_example"]
+
+
 # Parsers for supported types
-def parse_int(s: str) -> (int, str):
-    if (m := match(r"\s*(-?\d+)", s)) is not None:
-        return int(m[1]), s[m.end():]
-    else:
-        return None
+#
+# Each parser takes a lexer positioned where parsing should start, and returns the parsed value
+# leaving the lexer just after it (or _FAIL if parsing failed, in which case the lexer's position is unspecified).
+# The scalar parsers are just the lexer's own reads.
 
+# whole flat arrays of numbers, matching the same grammar as parse_list with parse_int/parse_real elements
+_int_list_pattern = re.compile(r"\s*\[\s*(?:(-?\d+(?:\s*,\s*-?\d+)*)\s*,?)?\s*]")
+_real_list_pattern = re.compile(r"\s*\[\s*(?:(-?\d+(?:\.\d+)?(?:\s*,\s*-?\d+(?:\.\d+)?)*)\s*,?)?\s*]")
 
-def parse_real(s: str) -> (float, str):
-    if (m := match(r"\s*(-?\d+(?:\.\d+)?)", s)) is not None:
-        return float(m[1]), s[m.end():]
-    else:
-        raise None
 
+parse_int = Lexer.read_int
+parse_real = Lexer.read_real
+parse_char = Lexer.read_char
+parse_bool = Lexer.read_bool
+parse_string = Lexer.read_string
 
-def parse_char(s: str) -> (str, str):
-    if (m := match(r"\s*'([^\\']|\\.)'", s)) is not None:
-        return m[1], s[m.end():]
-    else:
-        return None
 
+def parse_list(lx: Lexer, elem: Parser, depth: int = 1) -> Union[list, object]:
+    """
+    Parses a (possibly nested) list
 
-def parse_bool(s: str) -> (bool, str):
-    if (m := match(r"\s*(True|False)", s)) is not None:
-        return m[1] == "True", s[m.end():]
-    else:
-        return None
+    Nested lists are handled with an explicit stack rather than recursion,
+    so each extra level of nesting costs a list rather than a Python call per element.
 
+    :param lx: the lexer to parse from
+    :param elem: the parser for the innermost elements
+    :param depth: how many levels of lists are nested
+    :return: the parsed list if successful, otherwise :code:`_FAIL`
+    """
+    expect, delimiter = lx.expect, lx.delimiter
+    if not expect("["):
+        return _FAIL
 
-def parse_string(s: str) -> (str, str):
-    if (m := match(r'\s*"((?:[^\\"]|\\.)*)"', s)) is not None:
-        return m[1], s[m.end():]
-    else:
-        return None
+    stack = [[]]
+    while True:
+        level = stack[-1]
+        if len(stack) < depth:
+            if expect("["):
+                stack.append([])
+                continue
 
+            delim = delimiter()
+        elif (v := elem(lx)) is not _FAIL:
+            level.append(v)
 
-def parse_list(s: str, elem: Parser) -> (list, str):
-    if (m := match(r"\s*\[", s)) is None:
-        return None
+            if (delim := delimiter()) == ",":
+                continue
+        else:
+            delim = delimiter()
 
-    res = []
-    rem = s[m.end():]
-    while (inner_m := elem(rem)) is not None:
-        v, rem = inner_m
-        res.append(v)
+        # there are no more values at this level, so close it (and any enclosing lists which are also finished)
+        while True:
+            if delim != "]":
+                return _FAIL
 
-        if (sep := match(r"\s*,", rem)) is None:
-            break
+            stack.pop()
+            if not stack:
+                return level
 
-        rem = rem[sep.end():]
+            stack[-1].append(level)
+            if (delim := delimiter()) == ",":
+                break
 
-    if (m := match(r"\s*]", rem)) is not None:
-        return res, rem[m.end():]
-    else:
-        return None
+            level = stack[-1]
+
+
+def parse_int_list(lx: Lexer) -> Union[List[int], object]:
+    return parse_numeric_list(lx, _int_list_pattern, int, parse_int)
+
+
+def parse_real_list(lx: Lexer) -> Union[List[float], object]:
+    return parse_numeric_list(lx, _real_list_pattern, float, parse_real)
 
 
-def parse_missing(s: str) -> (None, str):
+def parse_numeric_list(lx: Lexer, pattern, convert: Callable, elem: Parser) -> Union[list, object]:
+    """
+    Parses a flat list of numbers in bulk
+
+    The whole list is recognised in one pass of :code:`pattern` and then converted with :code:`map`,
+    so there is no Python-level parser call per element.
+    Falls back to :code:`parse_list` if the list does not match.
+
+    :param lx: the lexer to parse from
+    :param pattern: a pattern matching the whole list, capturing the comma-separated values
+    :param convert: converts a single value
+    :param elem: the parser for a single value
+    :return: the parsed list if successful, otherwise :code:`_FAIL`
+    """
+    if (m := pattern.match(lx.s, lx.i)) is None:
+        return parse_list(lx, elem)
+
+    lx.i = m.end()
+    values = m[1]
+    return list(map(convert, values.split(","))) if values else []
+
+
+def parse_missing(lx: Lexer) -> Optional[object]:
     """
     A special parser meant to parse the void value '_'
 
-    :param s: the string to parse
-    :return: a tuple, shifting the input string correctly, if parsing occurred otherwise :code:`None`
+    :param lx: the lexer to parse from
+    :return: :code:`None` if the value was parsed, otherwise :code:`_FAIL`
     """
-    if (m := match(r"\s*_", s)) is not None:
-        return None, s[m.end():]
-    else:
+    if lx.expect("_"):
         return None
+    else:
+        return _FAIL
 
 
 def parser_for(c_type: CType) -> Parser:
     """
     Fetch the correct parser for a given type
 
-    Recursively wraps pointers in lists if necessary.
+    Wraps pointers in (nested) lists if necessary.
+    Parsers are cached, so the same type always gets the same parser.
 
     :param c_type: the type to parse
-    :return: a function taking a string as input and returning a the parse of the string for the given type
+    :return: a function taking a lexer as input and returning the parse of the string for the given type
     """
-    if c_type.contents == "void":
+    return _parser_for(c_type.contents, c_type.pointer_level)
+
+
+# parsers for scalars, and for flat arrays which can be parsed in bulk, indexed by the type's contents
+scalar_parsers = {"int": parse_int,
+                  "float": parse_real,
+                  "double": parse_real,
+                  "char": parse_char,
+                  "bool": parse_bool,
+                  }
+array_parsers = {"int": parse_int_list,
+                 "float": parse_real_list,
+                 "double": parse_real_list,
+                 "char": parse_string,
+                 }
+
+
+@lru_cache(maxsize=None)
+def _parser_for(contents: str, pointer_level: int) -> Parser:
+    if contents == "void":
         return parse_missing
 
-    if c_type == CType("char", 1):
-        return parse_string
-
-    if c_type.pointer_level >= 1:
-        inner_parser = parser_for(CType(c_type.contents, c_type.pointer_level - 1))
-        return lambda s: parse_list(s, inner_parser)
-
-    if c_type.contents == "int":
-        return parse_int
-    elif c_type.contents == "float" or c_type.contents == "double":
-        return parse_real
-    elif c_type.contents == "char":
-        return parse_char
-    elif c_type.contents == "bool":
-        return parse_bool
+    if contents not in scalar_parsers:
+        raise UnsupportedTypeError(CType(contents, 0))
+
+    if pointer_level == 0:
+        return scalar_parsers[contents]
+
+    if pointer_level == 1 and contents in array_parsers:
+        return array_parsers[contents]
+
+    depth = pointer_level
+    if contents == "char":
+        # the innermost level of a char pointer is a string rather than a list
+        leaf, depth = parse_string, depth - 1
     else:
-        raise UnsupportedTypeError(c_type)
+        leaf = scalar_parsers[contents]
+
+    return lambda lx: parse_list(lx, leaf, depth)
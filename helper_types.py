@@ -1,4 +1,5 @@
-from typing import Union, NewType, Callable, Optional
+import collections.abc
+from typing import Union, NewType, Callable, Optional, Mapping
 from typing import Dict, List, Tuple, Set
 
 # HELPFUL CONSTANTS
@@ -18,7 +19,33 @@ AnyValue = Union[SomeValue, None]
 Name = NewType("Name", str)
 Parser = NewType("Parser", Callable)
 
-ParameterMapping = Dict[Name, SomeValue]
+ParameterMapping = Mapping[Name, SomeValue]
+
+
+class ParameterValues(collections.abc.Mapping):
+    """
+    A read-only parameter mapping which stores its values in signature order
+
+    Mappings for the same signature share one table of parameter positions,
+    so each mapping only needs to hold a tuple of values rather than a whole dict.
+    """
+    __slots__ = ("positions", "values")
+
+    def __init__(self, positions: Dict[Name, int], values: tuple):
+        self.positions = positions
+        self.values = values
+
+    def __getitem__(self, name: Name) -> SomeValue:
+        return self.values[self.positions[name]]
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __repr__(self):
+        return repr(dict(self))
 
 # ERROR TYPES
 
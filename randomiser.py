@@ -1,6 +1,8 @@
 import random
 import string
 
+import numpy as np
+
 from helper_types import ConstraintError
 from typing import Dict, List, Tuple, Set
 
@@ -11,10 +13,45 @@ class Randomiser:
                  "char": " " + string.ascii_letters,
                  "bool": [True, False],
                  }
+    int_buffer_size = 1024
+    int64_range = (int(np.iinfo(np.int64).min), int(np.iinfo(np.int64).max))
+
     def __init__(self, seed=None):
         if seed:
             random.seed(seed)
 
+        self._rng = None
+        self._int_buffers = {}
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """
+        A numpy generator used to make whole arrays at once
+
+        It is seeded from :code:`random`, so seeding that also makes the arrays reproducible.
+        Only created when an array is first generated, as many randomisers are only used for a single scalar.
+
+        :return: the generator
+        """
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+
+        return self._rng
+
+    @staticmethod
+    def _numpy_int_bounds(min_val, max_val) -> bool:
+        """
+        Checks whether numpy can generate ints in a range
+
+        numpy only handles integral bounds which fit in 64 bits, any other range falls back to :code:`random`.
+
+        :param min_val: the lower bound of the range
+        :param max_val: the upper bound of the range
+        :return: whether the range can be given to numpy
+        """
+        low, high = Randomiser.int64_range
+        return isinstance(min_val, int) and isinstance(max_val, int) and low <= min_val and max_val <= high
+
     def random_int(self, min_val=None, max_val=None):
         defaults = Randomiser.defaults["int"]
 
@@ -24,7 +61,16 @@ class Randomiser:
         if min_val > max_val:
             raise ConstraintError(f"can not constrain in {min_val} <= x <= {max_val}")
 
-        return random.randint(min_val, max_val)
+        if not Randomiser._numpy_int_bounds(min_val, max_val):
+            return random.randint(min_val, max_val)
+
+        # ints are generated in blocks for each range, as taking one from a list is much cheaper than a single draw
+        buffer = self._int_buffers.get((min_val, max_val))
+        if not buffer:
+            buffer = self.random_int_array(Randomiser.int_buffer_size, min_val=min_val, max_val=max_val)
+            self._int_buffers[(min_val, max_val)] = buffer
+
+        return buffer.pop()
 
     def random_float(self, min_val=None, max_val=None):
         defaults = Randomiser.defaults["float"]
@@ -57,9 +103,59 @@ class Randomiser:
 
         return random.choice(alphabet)
 
+    def random_string(self, length: int, alphabet=None):
+        assert length >= 0
+        if alphabet is None:
+            alphabet = Randomiser.defaults["char"]
+
+        if len(alphabet) < 1:
+            raise ConstraintError("can not select random char from empty set")
+
+        return ''.join(random.choices(alphabet, k=length))
+
     def random_bool(self):
-        return random.choice(Randomiser.defaults["bool"])
+        # a single random bit, rather than choosing from Randomiser.defaults["bool"]
+        return bool(random.getrandbits(1))
 
     def random_array(self, length: int, elem_gen):
         assert length >= 0
         return [elem_gen() for _ in range(length)]
+
+    def random_int_array(self, length: int, min_val=None, max_val=None):
+        assert length >= 0
+        defaults = Randomiser.defaults["int"]
+
+        min_val = defaults[0] if min_val is None else min_val
+        max_val = defaults[1] if max_val is None else max_val
+
+        if min_val > max_val:
+            raise ConstraintError(f"can not constrain in {min_val} <= x <= {max_val}")
+
+        if not Randomiser._numpy_int_bounds(min_val, max_val):
+            return [random.randint(min_val, max_val) for _ in range(length)]
+
+        return self.rng.integers(min_val, max_val, size=length, endpoint=True).tolist()
+
+    def random_float_array(self, length: int, min_val=None, max_val=None):
+        assert length >= 0
+        defaults = Randomiser.defaults["float"]
+
+        min_val = defaults[0] if min_val is None else min_val
+        max_val = defaults[1] if max_val is None else max_val
+
+        if min_val > max_val:
+            raise ConstraintError(f"can not constrain in {min_val} <= x <= {max_val}")
+
+        return (self.rng.random(length) * (max_val - min_val) + min_val).tolist()
+
+    def random_double_array(self, length: int, min_val=None, max_val=None):
+        defaults = Randomiser.defaults["double"]
+
+        min_val = defaults[0] if min_val is None else min_val
+        max_val = defaults[1] if max_val is None else max_val
+
+        return self.random_float_array(length, min_val=min_val, max_val=max_val)
+
+    def random_bool_array(self, length: int):
+        assert length >= 0
+        return self.rng.integers(0, 2, size=length).astype(bool).tolist()
@@ -1,19 +1,40 @@
 import os.path
 import re
-from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from dataclasses import dataclass, asdict, astuple
 from enum import Enum
-from json import dumps
-from sys import stderr
+from json import dump
+from sys import intern, stderr, stdout
+from types import CodeType
 from typing import *
 
 import lumberjack
 from helper_types import *
 from typing import Dict, List, Tuple, Set
 
-def removeprefix(text, prefix):
-    if text.startswith(prefix):
-        return text[len(prefix):]
-    return text  # or whatever
+
+# patterns used while parsing references, compiled once rather than looked up on every use
+_param_pattern = re.compile("((?:int|char|float|double|bool|void)[* ]+)(.*)")
+# the (indented) start of a line beginning with a type, and an (indented) include line
+_function_start_pattern = re.compile(r"^[^\S\n]*(?=int|float|double|char|bool|void)", re.MULTILINE)
+_include_pattern = re.compile(r"^[^\S\n]*(#include[^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+
+def _compile_expression(expr: str, kind: str) -> Optional[CodeType]:
+    """
+    Compiles an expression from a *props* file once, so using it does not reparse the source every time
+
+    An invalid expression does not stop the reference from loading, it is reported as an issue instead.
+
+    :param expr: the python expression
+    :param kind: what the expression is for, used in the filename of the code object
+    :return: the code object for the expression, :code:`None` if the expression is invalid
+    """
+    try:
+        return compile(expr.strip(), f"<{kind}>", "eval")
+    except SyntaxError:
+        return None
 
 
 class ParseIssue(Enum):
@@ -26,6 +47,7 @@ class ParseIssue(Enum):
     ArrayReturnType = "Return type must be `void' or scalar"
     MultiLevelPointer = "Multi-level pointers are not supported"
     ScalarOutputParameter = "Output parameters must be pointers"
+    UnknownOutputParameter = "Outputs must name a parameter"
     ScalarGivenSize = "Only array parameters can be given a size"
     GivenInvalidSize = "Sizes must be a valid type"
     UnsizedArrayParameter = "All unterminated arrays must be given a size"
@@ -35,9 +57,13 @@ class ParseIssue(Enum):
 
     @staticmethod
     def ignorable():
-        return {
-            ParseIssue.ScalarGivenSize,
-        }
+        return _ignorable_issues
+
+
+# issues which do not stop a reference from being used, shared rather than rebuilt for every validation
+_ignorable_issues = frozenset({
+    ParseIssue.ScalarGivenSize,
+})
 
 
 @dataclass
@@ -45,10 +71,13 @@ class CType:
     """
     A wrapper for a C type.
     """
+    __slots__ = ("contents", "pointer_level")
+
     contents: str
     pointer_level: int
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def parse(type_sig: str):
         """
         Build a type instance from a type signature.
@@ -56,6 +85,7 @@ class CType:
         Type signatures can look like: :code:`int`, :code:`int *`, :code:`char*`, :code:`void ** *`, etc.
 
         No checking is done here to determine whether the type is valid.
+        The same few types come up constantly, so parsed types are cached and shared: they must not be modified.
 
         :param type_sig: the type signature
         :return: an instance of that type
@@ -75,38 +105,49 @@ class CType:
         if pointer_level > 1:
             raise UnsupportedTypeError("multi-level pointers")
 
-        return CType(contents, pointer_level)
+        # the same few type names come up over and over, so they can all share one string
+        return CType(intern(contents), pointer_level)
 
     def __str__(self):
         return f"{self.contents}{'*' * self.pointer_level}"
 
 
+# types which are checked for often, so they do not need to be rebuilt for every comparison
+string_type = CType("char", 1)
+void_type = CType("void", 0)
+
+
 @dataclass
 class CParameter:
     """
     A wrapper for a parameter.
     """
+    __slots__ = ("name", "type")
+
     name: Name
     type: CType
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def parse(param: str):
         """
         Builds a CParameter instance.
 
         Does not check if the type is a valid name, just separates it from the type.
+        Parsed parameters are cached and shared between signatures, so they must not be modified.
 
         :param param: the parameter definition
         :return: an instance from that definition
         """
-        m = re.match("((?:int|char|float|double|bool|void)[* ]+)(.*)", param)
+        m = _param_pattern.match(param)
         if m is None:
             raise ParseError("invalid parameter")
 
         c_type, name = m.groups()
 
+        # names are looked up by the sizes, outputs and constraints that refer to them, so they share one string
         type_info = CType.parse(c_type)
-        return CParameter(name, type_info)
+        return CParameter(intern(name), type_info)
 
     def __str__(self):
         return f"{self.type} {self.name}"
@@ -117,6 +158,8 @@ class FunctionSignature:
     """
     A C function's full signature
     """
+    __slots__ = ("name", "type", "parameters")
+
     name: Name
     type: CType
     parameters: List[CParameter]
@@ -135,12 +178,17 @@ class FunctionSignature:
         :param sig: the signature
         :return: the instance built from that signature
         """
-        m = re.match(r"(.*)\((.*)\)", sig)
-        if m is None:
+        # only the first line is used, split around the last bracketed section in it
+        line = sig.partition("\n")[0]
+        params_end = line.rfind(")")
+        params_start = line.rfind("(", 0, params_end)
+        if params_end < 0 or params_start < 0:
             raise ParseError("could not parse function signature")
 
-        func_def = CParameter.parse(m[1].strip())
-        params = [param.strip() for param in m[2].split(",")]
+        func_def = CParameter.parse(line[:params_start].strip())
+
+        params = line[params_start + 1:params_end]
+        params = [param.strip() for param in params.split(",")] if params.strip() else []
 
         return FunctionSignature(func_def.name,
                                  func_def.type,
@@ -165,6 +213,8 @@ class ParamSize:
     """
     The base type for sizes of array parameters
     """
+    __slots__ = ("arr",)
+
     arr: Name
 
     @staticmethod
@@ -176,37 +226,37 @@ class ParamSize:
         :param size: the size description
         :return: the actual size object built from that description
         """
-        size = size.lstrip()
-
-        parts = re.finditer(r"\s*,\s*", size)
+        arr, comma, rest = size.partition(",")
+        if not comma:
+            raise ParseError(f"invalid size: {size.strip()}")
 
-        part = next(parts)
-        arr_end, next_start = part.span()
-
-        arr = size[:part.span()[0]]
-        try:
-            part = next(parts)
-            val_end, expr_start = part.span()
+        arr = intern(arr.strip())
+        rest = rest.lstrip()
 
-            val = int(size[next_start:val_end])
-            expr = size[expr_start:].rstrip()
+        val, comma, expr = rest.partition(",")
+        if comma:
+            val = int(val)
+            expr = expr.strip()
 
             assert expr.startswith("{") and expr.endswith("}")
 
             return ExprSize(Name(arr), val, expr[1:-1])
-        except StopIteration:
-            try:
-                val = int(size[next_start:])
-                return ConstSize(Name(arr), val)
-            except ValueError:
-                var = size[next_start:].rstrip()
 
-                if var.startswith("{"):
-                    assert var.endswith("}")
+        rest = rest.rstrip()
 
-                    return SimpleExprSize(Name(arr), var[1:-1])
-                else:
-                    return VarSize(Name(arr), Name(var))
+        digits = rest[1:] if rest.startswith(("-", "+")) else rest
+        if digits.isdecimal():
+            return ConstSize(Name(arr), int(rest))
+        elif rest.startswith("{"):
+            assert rest.endswith("}")
+
+            return SimpleExprSize(Name(arr), rest[1:-1])
+        else:
+            return VarSize(Name(arr), Name(intern(rest)))
+
+    def __reduce__(self):
+        # code objects can not be pickled, so rebuild (and recompile) the size from its fields instead
+        return type(self), astuple(self)
 
     def evaluate(self, values: dict, initial: bool = False) -> Optional[int]:
         """
@@ -223,12 +273,23 @@ class ParamSize:
         """
         raise NotImplementedError("This is an abstract method, use the corresponding method in a subtype")
 
+    @property
+    def compiled(self) -> bool:
+        """
+        Determines if any expression in the size is valid, and so could be compiled
+
+        :return: whether or not the size can be evaluated
+        """
+        return True
+
 
 @dataclass
 class VarSize(ParamSize):
     """
     Denotes an association between a array parameter, and a scalar parameter containing the array's size
     """
+    __slots__ = ("var",)
+
     arr: Name
     var: Name
 
@@ -246,6 +307,8 @@ class ConstSize(ParamSize):
 
     Note this constant can also be treated as a *maximum* size.
     """
+    __slots__ = ("size",)
+
     arr: Name
     size: int
 
@@ -261,15 +324,24 @@ class ExprSize(ParamSize):
     Contains the size for the initial size of the array (for generation),
     and an expression to calculate the maximum size the array can be (to create a foreign array large enough).
     """
+    __slots__ = ("init", "expr", "_code")
+
     arr: Name
     init: int
     expr: str
 
+    def __post_init__(self):
+        self._code = _compile_expression(self.expr, "size")
+
+    @property
+    def compiled(self) -> bool:
+        return self._code is not None
+
     def evaluate(self, values: dict, initial: bool = False) -> Optional[int]:
         if initial:
             return self.init
         else:
-            size = eval(self.expr, dict(values))
+            size = eval(self._code, dict(values))
             assert size is not None and isinstance(size, int)
 
             return size
@@ -283,11 +355,20 @@ class SimpleExprSize(ParamSize):
     This is useful to encode a more complicated relationship between parameters,
     for example in matrices where the size of an m x n array M needs to be { m * n }
     """
+    __slots__ = ("expr", "_code")
+
     arr: Name
     expr: str
 
+    def __post_init__(self):
+        self._code = _compile_expression(self.expr, "size")
+
+    @property
+    def compiled(self) -> bool:
+        return self._code is not None
+
     def evaluate(self, values: dict, initial: bool = False) -> Optional[int]:
-        size = eval(self.expr, dict(values))
+        size = eval(self._code, dict(values))
         assert size is not None and isinstance(size, int)
 
         return size
@@ -297,6 +378,7 @@ class Constraint:
     """
     Base class for a constraint property
     """
+    __slots__ = ()
 
     @staticmethod
     def parse(constraint: str):
@@ -326,7 +408,11 @@ class Constraint:
 
             assert op in {">", "<", ">=", "<=", "==", "!="}
 
-            return ParamConstraint(Name(var), op, val)
+            return ParamConstraint(Name(intern(var)), op, val)
+
+    def __reduce__(self):
+        # code objects can not be pickled, so rebuild (and recompile) the constraint from its fields instead
+        return type(self), astuple(self)
 
     def satisfied(self, inputs: ParameterMapping) -> bool:
         """
@@ -337,18 +423,37 @@ class Constraint:
         """
         raise NotImplementedError("This is an abstract method, use the corresponding method in a subtype")
 
+    @property
+    def compiled(self) -> bool:
+        """
+        Determines if the expressions in the constraint are valid, and so could be compiled
+
+        :return: whether or not the constraint can be checked
+        """
+        raise NotImplementedError("This is an abstract method, use the corresponding method in a subtype")
+
 
 @dataclass
 class ParamConstraint(Constraint):
     """
     A constraint on a single parameter
     """
+    __slots__ = ("var", "op", "val", "_code", "_value_code")
+
     var: Name
     op: str
     val: str
 
+    def __post_init__(self):
+        self._code = _compile_expression(f"{self.var} {self.op} {self.val}", "constraint")
+        self._value_code = _compile_expression(self.val, "constraint")
+
     def satisfied(self, inputs: ParameterMapping) -> bool:
-        return eval(f"{self.var} {self.op} {self.val}", dict(inputs))
+        return eval(self._code, dict(inputs))
+
+    @property
+    def compiled(self) -> bool:
+        return self._code is not None and self._value_code is not None
 
     @property
     def value(self) -> SomeValue:
@@ -357,7 +462,7 @@ class ParamConstraint(Constraint):
 
         :return: the value in the constraint
         """
-        return eval(self.val)
+        return eval(self._value_code)
 
 
 @dataclass
@@ -365,10 +470,19 @@ class GlobalContstraint(Constraint):
     """
     A general constraint on any number of parameters
     """
+    __slots__ = ("predicate", "_code")
+
     predicate: str
 
+    def __post_init__(self):
+        self._code = _compile_expression(self.predicate, "constraint")
+
     def satisfied(self, inputs: ParameterMapping) -> bool:
-        return eval(self.predicate, dict(inputs))
+        return eval(self._code, dict(inputs))
+
+    @property
+    def compiled(self) -> bool:
+        return self._code is not None
 
 
 @dataclass
@@ -378,10 +492,25 @@ class FunctionInfo:
 
     This includes the names of any output parameters, and the given sizes of any array parameters.
     """
+    __slots__ = ("outputs", "sizes", "constraints", "_outputs", "_sizes")
+
     outputs: List[Name]
     sizes: List[ParamSize]
     constraints: List[Constraint]
 
+    def __post_init__(self):
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Rebuilds the lookups used to find outputs and sizes
+
+        These are built once rather than searching the lists for every parameter,
+        so this must be called after changing :code:`outputs` or :code:`sizes`.
+        """
+        self._outputs = set(self.outputs)
+        self._sizes = {size.arr: size for size in self.sizes}
+
     @staticmethod
     def parse(info: List[str]):
         """
@@ -397,13 +526,16 @@ class FunctionInfo:
         constraints = []
 
         for line in info:
-            if line.startswith("output"):
-                outputs.append(Name(removeprefix(line, "output").strip()))
-            elif line.startswith("size"):
-                size = ParamSize.parse(removeprefix(line, "size").strip())
+            # each directive starts with a different letter, so only one prefix needs checking
+            first = line[:1]
+
+            if first == "o" and line.startswith("output"):
+                outputs.append(Name(intern(line[len("output"):].strip())))
+            elif first == "s" and line.startswith("size"):
+                size = ParamSize.parse(line[len("size"):].strip())
                 sizes.append(size)
-            elif line.startswith("constraint"):
-                constraint = Constraint.parse(removeprefix(line, "constraint").strip())
+            elif first == "c" and line.startswith("constraint"):
+                constraint = Constraint.parse(line[len("constraint"):].strip())
                 constraints.append(constraint)
             else:
                 raise ParseError(f"invalid directive in props: {line.strip()}")
@@ -411,10 +543,10 @@ class FunctionInfo:
         return FunctionInfo(outputs, sizes, constraints)
 
     def is_output(self, param: CParameter) -> bool:
-        return param.name in self.outputs
+        return param.name in self._outputs
 
     def size(self, param: CParameter) -> Optional[ParamSize]:
-        return {size.arr: size for size in self.sizes}.get(param.name)
+        return self._sizes.get(param.name)
 
 
 @dataclass
@@ -424,6 +556,8 @@ class FunctionProps:
 
     This includes the signature and any additional information about the parameters.
     """
+    __slots__ = ("sig", "arr_info")
+
     sig: FunctionSignature
     arr_info: FunctionInfo
 
@@ -436,8 +570,13 @@ class FunctionProps:
         :return: the instance built from that file
         """
         with open(props_file, "r") as props:
-            sig = FunctionSignature.parse(props.readline())
-            rest = FunctionInfo.parse(props.readlines())
+            sig_line, *info_lines = props.read().split("\n")
+
+        if info_lines and not info_lines[-1]:
+            info_lines.pop()  # the file ended with a newline
+
+        sig = FunctionSignature.parse(sig_line)
+        rest = FunctionInfo.parse(info_lines)
 
         return FunctionProps(sig, rest)
 
@@ -449,9 +588,31 @@ class CReference:
 
     This is the :code:`#includes` found in the file, as well as the C implementation of the function itself.
     """
+    __slots__ = ("includes", "code", "_signature")
+
     includes: List[str]
     code: str
 
+    @property
+    def signature(self) -> Optional[FunctionSignature]:
+        """
+        The signature of the function as written in the C code
+
+        This is parsed from everything before the function body the first time it is needed, then kept.
+
+        :return: the signature of the reference function, or :code:`None` if it could not be parsed
+        """
+        try:
+            return self._signature
+        except AttributeError:
+            code = self.code
+            try:
+                self._signature = FunctionSignature.parse(code[:code.find("{")])
+            except (ParseError, UnsupportedTypeError):
+                self._signature = None
+
+            return self._signature
+
     @staticmethod
     def parse(ref_file: str):
         """
@@ -461,22 +622,18 @@ class CReference:
         :return: the instance built from that file
         """
         with open(ref_file, "r") as ref:
-            includes = []
-
-            # go through each line and:
-            #   1. store includes
-            #   2. ignore anything other than the function
-            #   3. store the function code
-            line = ""  # this is just to ensure line has SOME value, to shut the warning up
-            for line in ref:
-                line = line.lstrip()
-                if re.match("(int|float|double|char|bool|void)", line):
-                    break  # assumes everything from here is the actual function
+            text = ref.read()
 
-                if line.startswith("#include"):
-                    includes.append(line.rstrip())
+        # everything from the first line starting with a type is assumed to be the function,
+        # only the includes are kept from before that
+        m = _function_start_pattern.search(text)
+        if m is not None:
+            header, func = text[:m.start()], text[m.end():]
+        else:
+            # no function, so just keep the last line
+            header, func = text, text[text.rfind("\n", 0, len(text) - 1) + 1:].lstrip()
 
-            func = line + ref.read()
+        includes = _include_pattern.findall(header)
 
         return CReference(includes, func)
 
@@ -486,6 +643,8 @@ class FunctionReference:
     """
     Wrapper for all information about a given function.
     """
+    __slots__ = ("signature", "info", "reference")
+
     signature: FunctionSignature
     info: FunctionInfo
     reference: CReference
@@ -518,15 +677,20 @@ class FunctionReference:
         :param prog_name: the path to the function directory
         :return: the instance built for that function
         """
-        path = os.path.expanduser(prog_name)
+        path = os.path.abspath(os.path.expanduser(prog_name))
+        props_file, ref_file = os.path.join(path, "props"), os.path.join(path, "ref.c")
 
         try:
-            props = FunctionProps.parse(os.path.join(path, "props"))
-            ref = CReference.parse(os.path.join(path, "ref.c"))
+            props, ref = _parse_files(props_file, os.stat(props_file).st_mtime_ns,
+                                      ref_file, os.stat(ref_file).st_mtime_ns)
         except ParseError as e:
             raise ParseError(e.message, reference_name=os.path.split(prog_name)[1])
 
-        return FunctionReference(props.sig, props.arr_info, ref)
+        # the parse is shared between callers, but fixing issues edits the info, so each reference gets its own copy
+        info = props.arr_info
+        info = FunctionInfo(list(info.outputs), list(info.sizes), list(info.constraints))
+
+        return FunctionReference(props.sig, info, ref)
 
     def issues(self, fix: bool = False) -> Set[ParseIssue]:
         """
@@ -535,90 +699,117 @@ class FunctionReference:
         :param fix: set to :code:`True` to try and fix any issues that are encountered
         :return: all issues found in the function
         """
-        issues = set()
+        return set(self._find_issues(fix))
+
+    def is_valid(self, ignorable: Set[ParseIssue] = None) -> bool:
+        """
+        Check whether this FunctionReference has no issues other than ignorable ones
+
+        This stops at the first issue that can not be ignored, so it is cheaper than building the full set of issues.
+        No fixes are made.
+
+        :param ignorable: the issues which can be ignored, by default :code:`ParseIssue.ignorable()`
+        :return: :code:`True` if only ignorable issues were found
+        """
+        if ignorable is None:
+            ignorable = _ignorable_issues
+
+        return all(issue in ignorable for issue in self._find_issues(fix=False))
 
+    def _find_issues(self, fix: bool) -> Iterator[ParseIssue]:
+        """
+        Find the issues in this FunctionReference, cheapest checks first
+
+        An issue may be found more than once.
+        Fixes are only completed once every issue has been found.
+
+        :param fix: set to :code:`True` to try and fix any issues that are encountered
+        :return: a generator over the issues found
+        """
         if self.type.pointer_level != 0:
-            issues.add(ParseIssue.ArrayReturnType)
+            yield ParseIssue.ArrayReturnType
+
+        info = self.info
 
-        # building lookup tables
+        # building lookup tables, checking outputs and missing sizes along the way
         param_dict = dict()
         array_params = set()
-        scalar_params = set()
+        scalar_outputs = set()
         for param in self.parameters:
             name = param.name
             c_type = param.type
 
             param_dict[name] = c_type
-            if c_type.pointer_level == 0:
-                scalar_params.add(name)
-            elif c_type.pointer_level == 1:
+            # CType.parse rejects multi-level pointers, so anything with a pointer is an array
+            if c_type.pointer_level:
                 array_params.add(name)
-            else:
-                issues.add(ParseIssue.MultiLevelPointer)
+
+                if info.size(param) is None:
+                    if fix and c_type == string_type:
+                        default_str_size = 100
+                        info.sizes.append(ConstSize(name, default_str_size))
+                    else:
+                        yield ParseIssue.UnsizedArrayParameter
+            elif info.is_output(param):
+                if fix:
+                    scalar_outputs.add(name)
+                else:
+                    yield ParseIssue.ScalarOutputParameter
 
             # this is a SUPER simplified version of checking for valid C identifiers
             # doesn't take keywords etc. into consideration
-            m = re.match(r"^[a-zA-Z_]\w*$", name, flags=re.ASCII)
-            if not m or m[0] != name:
-                issues.add(ParseIssue.InvalidIdentifierName)
+            if not (name.isascii() and name.isidentifier()):
+                yield ParseIssue.InvalidIdentifierName
+
+        unknown_outputs = set(info.outputs) - param_dict.keys()
+        if unknown_outputs and not fix:
+            yield ParseIssue.UnknownOutputParameter
+
+        for constraint in info.constraints:
+            if not constraint.compiled:
+                yield ParseIssue.InvalidConstraint
+                continue
 
-        for constraint in self.info.constraints:
             if not isinstance(constraint, ParamConstraint):
                 continue
 
             if (constraint.var in array_params or param_dict[
                 constraint.var].contents == "char") and constraint.op not in {"==", "!="}:
-                issues.add(ParseIssue.InvalidConstraint)
-
-        for output in self.info.outputs:
-            if param_dict[output].pointer_level == 0:
-                if fix:
-                    self.info.outputs.remove(output)
-                else:
-                    issues.add(ParseIssue.ScalarOutputParameter)
+                yield ParseIssue.InvalidConstraint
 
-        sized = set()
-        for size in self.info.sizes:
-            array = size.arr
-            sized.add(array)
+        for size in info.sizes:
+            if size.arr not in array_params and not fix:
+                yield ParseIssue.ScalarGivenSize
 
-            if array not in array_params:
-                if fix:
-                    self.info.sizes.remove(size)
-                else:
-                    issues.add(ParseIssue.ScalarGivenSize)
+            if not size.compiled:
+                yield ParseIssue.GivenInvalidSize
 
             if isinstance(size, VarSize):
                 var = size.var
 
-                if param_dict[var].contents not in {"int"}:
-                    issues.add(ParseIssue.GivenInvalidSize)
+                if param_dict[var].contents != "int":
+                    yield ParseIssue.GivenInvalidSize
             elif isinstance(size, ConstSize):
                 if size.size < 0:
-                    issues.add(ParseIssue.GivenInvalidSize)
+                    yield ParseIssue.GivenInvalidSize
             elif isinstance(size, ExprSize):
                 if size.init < 0:
-                    issues.add(ParseIssue.GivenInvalidSize)
-
-        for array in array_params - sized:
-            if fix and param_dict[array] == CType("char", 1):
-                default_str_size = 100
-                self.info.sizes.append(ConstSize(array, default_str_size))
-            else:
-                issues.add(ParseIssue.UnsizedArrayParameter)
+                    yield ParseIssue.GivenInvalidSize
 
-        code = self.code
-        ref_signature = FunctionSignature.parse(code[:code.find("{")])
+        if fix:
+            # rebuilt in one go, rather than removing from the lists while they are being looped over
+            info.outputs[:] = [output for output in info.outputs
+                               if output not in scalar_outputs and output not in unknown_outputs]
+            info.sizes[:] = [size for size in info.sizes if size.arr in array_params]
+            info.refresh()
 
-        if ref_signature != self.signature:
+        if self.reference.signature != self.signature:
             # try and fix here if possible
-            issues.add(ParseIssue.ReferenceSignatureMismatch)
-
-        return issues
+            yield ParseIssue.ReferenceSignatureMismatch
 
     def validate(self, issues, ignorable: Set[issues] = None):
         if ignorable is None:
-            ignorable = ParseIssue.ignorable()
+            ignorable = _ignorable_issues
 
         if issues - ignorable:
             raise ParseError("parse contained issues", reference_name=self.name)
@@ -637,7 +828,8 @@ class FunctionReference:
                 print(f" - {issue.value}", file=stderr)
 
             if verbose:
-                print(dumps(asdict(self), indent=4) + "\n", file=stderr)
+                dump(asdict(self), stderr, indent=4)
+                stderr.write("\n\n")
         elif not ignore_good:
             print(f"{self.name} is good", file=stderr)
 
@@ -656,6 +848,34 @@ class FunctionReference:
         logger.warning(msg)
 
 
+@lru_cache(maxsize=4096)
+def _parse_files(props_file: str, props_mtime: int, ref_file: str, ref_mtime: int) -> Tuple[FunctionProps, CReference]:
+    """
+    Parses the *props* and *ref.c* files of a function
+
+    The modification times are only used as part of the cache key, so a reference is parsed again if it changes.
+
+    :param props_file: the path to the *props* file
+    :param props_mtime: the modification time of the *props* file
+    :param ref_file: the path to the *ref.c* file
+    :param ref_mtime: the modification time of the *ref.c* file
+    :return: the parsed props and reference
+    """
+    return FunctionProps.parse(props_file), CReference.parse(ref_file)
+
+
+def _parse_and_check(path_to_ref: str) -> Tuple[FunctionReference, Set[ParseIssue]]:
+    """
+    Parses a single function and finds its issues, for use in a worker process
+
+    :param path_to_ref: the reference directory
+    :return: the parsed function and its issues
+    """
+    parsed = FunctionReference.parse(path_to_ref)
+
+    return parsed, parsed.issues()
+
+
 def show_all(base_path: str) -> None:
     """
     Parse and show the C signature for all functions in a given directory.
@@ -666,29 +886,33 @@ def show_all(base_path: str) -> None:
     """
     base_path = os.path.expanduser(base_path)
 
-    for directory in os.listdir(base_path):
-        # breaking these up cos one big if was ugly
-        if directory.startswith("__"):
-            continue
+    dir_paths = []
+    with os.scandir(base_path) as directories:
+        for directory in directories:
+            # breaking these up cos one big if was ugly
+            if directory.name.startswith("__"):
+                continue
 
-        if directory.startswith("."):
-            continue
+            if directory.name.startswith("."):
+                continue
 
-        # building out the proper path to the function
-        dir_path = os.path.join(base_path, directory)
+            if not directory.is_dir():
+                continue
 
-        if not os.path.isdir(dir_path):
-            continue
+            # a single read of the directory is enough to check for both files
+            with os.scandir(directory.path) as files:
+                names = {file.name for file in files}
 
-        if "ref.c" not in os.listdir(dir_path):
-            continue
+            if not {"ref.c", "props"} <= names:
+                continue
 
-        if "props" not in os.listdir(dir_path):
-            continue
+            dir_paths.append(directory.path)
 
-        parsed = FunctionReference.parse(dir_path)
-        parsed.show_issues(parsed.issues(), ignore_good=True)
-        print(parsed.signature.c_sig())
+    # each function is independent, so they are parsed in parallel and shown in the original order
+    with ProcessPoolExecutor() as pool:
+        for parsed, issues in pool.map(_parse_and_check, dir_paths):
+            parsed.show_issues(issues, ignore_good=True)
+            print(parsed.signature.c_sig())
 
 
 def show_single(path_to_ref: str):
@@ -705,7 +929,8 @@ def show_single(path_to_ref: str):
     if issues:
         contents.show_issues(issues, verbose=True)
     else:
-        print(dumps(asdict(contents), indent=4))
+        dump(asdict(contents), stdout, indent=4)
+        stdout.write("\n")
 
 
 def load_reference(path_to_reference: str, log_issues: Callable = FunctionReference.log_issues) -> FunctionReference:
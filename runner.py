@@ -11,7 +11,7 @@ import reference_parser
 import utilities
 from helper_types import *
 from reference_parser import FunctionReference, ParamSize, Constraint, GlobalContstraint, \
-    ParamConstraint, CType
+    ParamConstraint, CType, void_type
 
 
 @dataclass
@@ -40,7 +40,7 @@ class Parameter:
         otherwise the length of the value is used (only for array parameters).
         :return: the foreign value that has been created
         """
-        assert self.type != CType("void", 0)
+        assert self.type != void_type
         if self.type.contents == "char":
             value = value.encode("ascii")
 
@@ -117,7 +117,8 @@ class Parameter:
     def is_array(self) -> bool:
         return self.type.pointer_level == 1
 
-    def get_size(self, value: Optional[ArrayValue], values: ParameterMapping) -> int:
+    def get_size(self, value: Optional[ArrayValue], values: ParameterMapping,
+                 rand: Optional[randomiser.Randomiser] = None) -> int:
         """
         Retrieve the size for the current (array) parameter
 
@@ -127,6 +128,7 @@ class Parameter:
         :param value: passing a list here means the initial array has been generated,
         so the size of the final array is returned.
         :param values: mapping of currently generated parameter values
+        :param rand: the randomiser used to pick the size of an initial array, a new one is made if not given
         :return: the size of the array
         """
 
@@ -141,7 +143,7 @@ class Parameter:
         def without_val():
             size = self.size.evaluate(values, True)
             if isinstance(self.size, reference_parser.ConstSize) or isinstance(self.size, reference_parser.ExprSize):
-                return randomiser.Randomiser().random_int(max_val=size)
+                return (rand or randomiser.Randomiser()).random_int(max_val=size)
             else:
                 return size
 
@@ -150,6 +152,26 @@ class Parameter:
         else:
             return with_val()
 
+    def size_generator(self, rand: randomiser.Randomiser) -> Callable[[ParameterMapping], int]:
+        """
+        Builds a function giving the size of the initial (native value) array for the current (array) parameter
+
+        This gives the same sizes as calling :code:`get_size` without a value,
+        but the kind of size is only checked once rather than for every array generated.
+
+        :param rand: the randomiser used to pick sizes
+        :return: a function taking the mapping of currently generated parameter values and returning a size
+        """
+        if isinstance(self.size, reference_parser.VarSize):
+            var = self.size.var
+            return lambda values: values[var]
+        elif isinstance(self.size, reference_parser.ConstSize) or isinstance(self.size, reference_parser.ExprSize):
+            max_size = self.size.evaluate({}, True)
+            random_int = rand.random_int
+            return lambda values: random_int(max_val=max_size)
+        else:
+            return lambda values: self.get_size(None, values, rand)
+
     @property
     def value(self):
         """
@@ -207,10 +229,18 @@ class Function:
 
         self.parameters = Parameter.get(reference.parameters, reference.info, param_constraints)
 
+        # the parameters never change once the function is built, so these are only worked out once
+        self.output_parameters = [param for param in self.parameters if param.is_output]
+        self._safe_parameters = None
+
+        # global constraints are checked before parameter constraints
+        self._all_constraints = self.constraints + [constraint for parameter in self.parameters
+                                                    for constraint in parameter.constraints]
+
         self.type = reference.type
 
         # only works for scalar outputs
-        if reference.type == CType("void", 0):
+        if reference.type == void_type:
             exe.restype = None
         else:
             assert reference.type.pointer_level == 0
@@ -254,7 +284,7 @@ class Function:
 
         :return: names and values of all output parameters
         """
-        return {param.name: param.value for param in self.parameters if param.is_output}
+        return {param.name: param.value for param in self.output_parameters}
 
     def safe_parameters(self) -> List[Parameter]:
         """
@@ -273,10 +303,13 @@ class Function:
 
         :return: the safe ordering
         """
-        scalars = [param for param in self.parameters if not param.is_array()]
-        arrays = [param for param in self.parameters if param.is_array()]
+        if self._safe_parameters is None:
+            scalars = [param for param in self.parameters if not param.is_array()]
+            arrays = [param for param in self.parameters if param.is_array()]
 
-        return scalars + arrays
+            self._safe_parameters = scalars + arrays
+
+        return self._safe_parameters
 
     @staticmethod
     def split_constraints(constraints: List[reference_parser.Constraint]) -> Tuple[
@@ -310,14 +343,10 @@ class Function:
         :param inputs: the values of the input parameters
         :return: :code:`True` if all constraints are satisfied
         """
-        if not (self.constraints or any(parameter.constraints for parameter in self.parameters)):
+        if not self._all_constraints:
             return True
 
-        globals = (constraint.satisfied(inputs) for constraint in self.constraints)
-        parameter = (constraint.satisfied(inputs) for parameter in self.parameters for constraint in
-                     parameter.constraints)
-
-        return all(globals) and all(parameter)
+        return all(constraint.satisfied(inputs) for constraint in self._all_constraints)
 
 def compile_obj(path_to_compilable: str, obj_path: str, optLevel: str = '0'):
     """